@@ -1,9 +1,11 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 from matplotlib.ticker import FuncFormatter
 from datetime import date
 import pandas as pd
-from portfolio import Portfolio, TickerWeight
+from portfolio import Portfolio, TickerWeight, fetch_market_returns
 
 def plot_portfolio_metrics(*portfolios, initial_investment=10000):
     """
@@ -15,75 +17,72 @@ def plot_portfolio_metrics(*portfolios, initial_investment=10000):
     """
     metrics = []
 
-    # Compute metrics for each portfolio
-    for portfolio in portfolios:
-        returns, value, cumulative_pnl, pnl = portfolio.portfolio_return_metrics()
-        monthly_returns = returns.resample('ME').apply(lambda x: (1 + x).prod() - 1)
+    # Compute metrics for each portfolio in parallel; they are independent,
+    # so submission order keys the results back to plotting order
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        return_futures = [executor.submit(portfolio.portfolio_return_metrics) for portfolio in portfolios]
+        volatility_futures = [executor.submit(portfolio.portfolio_volatility_metrics) for portfolio in portfolios]
+        return_metrics = [future.result() for future in return_futures]
+        volatility_metrics = [future.result() for future in volatility_futures]
+
+    for returns, value, cumulative_pnl, pnl in return_metrics:
+        # Compound within each month via log returns: summing log1p then expm1
+        # matches (1 + x).prod() - 1 without a Python lambda per group
+        monthly_returns = np.expm1(np.log1p(returns).resample('ME').sum())
         metrics.append((monthly_returns, value, cumulative_pnl, pnl))
 
-    # Plot monthly returns
-    plt.figure(figsize=(7, 3.5))
-    for i, (monthly_returns, _, _, _) in enumerate(metrics):
-        plt.bar(monthly_returns.index, monthly_returns * 100, label=f'Portfolio {i+1}', alpha=0.5, width=20)
-    plt.title('Monthly Returns')
-    plt.xlabel('Date')
-    plt.ylabel('Monthly Returns (%)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.legend()
-    plt.show()
+    # Draw all four comparison plots on one figure: a single canvas means one
+    # tight_layout pass and one draw/flush cycle instead of four
+    fig, axes = plt.subplots(2, 2, figsize=(14, 7))
+    ax_returns, ax_value, ax_cumulative_pnl, ax_pnl = axes.flat
+    dollar_formatter = FuncFormatter(lambda x, _: f'${x:.2f}')
 
-    # Plot portfolio value
-    plt.figure(figsize=(7, 3.5))
-    for i, (_, value, _, _) in enumerate(metrics):
-        plt.plot(value.index, value * initial_investment, label=f'Portfolio {i+1}')
-    plt.title(f'Portfolio Value (Initial Investment ${initial_investment:d})')
-    plt.xlabel('Date')
-    plt.ylabel('Portfolio Value')
-    plt.gca().yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'${x:.2f}'))
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.legend()
-    plt.show()
+    for i, (monthly_returns, value, cumulative_pnl, pnl) in enumerate(metrics):
+        label = f'Portfolio {i+1}'
+        ax_returns.bar(monthly_returns.index, monthly_returns * 100, label=label, alpha=0.5, width=20)
+        ax_value.plot(value.index, value * initial_investment, label=label)
+        ax_cumulative_pnl.plot(cumulative_pnl.index, cumulative_pnl * 100, label=label)
+        ax_pnl.plot(pnl.index, pnl * initial_investment, label=label)
 
-    # Plot portfolio cumulative P&L
-    plt.figure(figsize=(7, 3.5))
-    for i, (_, _, cumulative_pnl, _) in enumerate(metrics):
-        plt.plot(cumulative_pnl.index, cumulative_pnl * 100, label=f'Portfolio {i+1}')
-    plt.title('Portfolio Cumulative P&L')
-    plt.xlabel('Date')
-    plt.ylabel('P&L (%)')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.legend()
-    plt.show()
+    ax_returns.set_title('Monthly Returns')
+    ax_returns.set_ylabel('Monthly Returns (%)')
+
+    ax_value.set_title(f'Portfolio Value (Initial Investment ${initial_investment:d})')
+    ax_value.set_ylabel('Portfolio Value')
+    ax_value.yaxis.set_major_formatter(dollar_formatter)
+
+    ax_cumulative_pnl.set_title('Portfolio Cumulative P&L')
+    ax_cumulative_pnl.set_ylabel('P&L (%)')
 
-    # Plot portfolio monthly P&L
-    plt.figure(figsize=(7, 3.5))
-    for i, (_, _, _, pnl) in enumerate(metrics):
-        plt.plot(pnl.index, pnl * initial_investment, label=f'Portfolio {i+1}')
-    plt.title(f'Portfolio Monthly P&L (Initial Investment ${initial_investment:d})')
-    plt.xlabel('Date')
-    plt.ylabel('P&L')
-    plt.gca().yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'${x:.2f}'))
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.legend()
+    ax_pnl.set_title(f'Portfolio Monthly P&L (Initial Investment ${initial_investment:d})')
+    ax_pnl.set_ylabel('P&L')
+    ax_pnl.yaxis.set_major_formatter(dollar_formatter)
+
+    for ax in axes.flat:
+        ax.set_xlabel('Date')
+        ax.tick_params(axis='x', rotation=45)
+        ax.legend()
+
+    fig.tight_layout()
     plt.show()
 
-    # Plot asset volatility decomposition for each portfolio
+    # Plot asset volatility decomposition for each portfolio; the colormap is
+    # sliced once up front rather than per pie
+    colormap = plt.cm.tab20.colors
     for i, portfolio in enumerate(portfolios):
+        labels = list(portfolio.tickers)
+        colors = colormap[:len(labels)]
         plt.figure(figsize=(7, 7))
         asset_volatilities = portfolio.asset_volatility_decomposition()
-        plt.pie(asset_volatilities, labels=[tw.ticker for tw in portfolio.assets], autopct='%1.1f%%', startangle=90, pctdistance=0.85,
-                wedgeprops=dict(width=0.4), colors=plt.cm.tab20.colors)
+        plt.pie(asset_volatilities, labels=labels, autopct='%1.1f%%', startangle=90, pctdistance=0.85,
+                wedgeprops=dict(width=0.4), colors=colors)
         plt.title(f'Asset Volatility Decomposition (Portfolio {i+1})', loc='center')
         plt.axis('equal')
         plt.show()
 
     # Print formatted volatility metrics for each portfolio
     for i, portfolio in enumerate(portfolios):
-        portfolio_std, portfolio_beta, annualized_sharpe_ratio, portfolio_cvar, sortino_ratio = portfolio.portfolio_volatility_metrics()
+        portfolio_std, portfolio_beta, annualized_sharpe_ratio, portfolio_cvar, sortino_ratio = volatility_metrics[i]
 
         metrics_table = pd.DataFrame({
             "Metric": ["Portfolio Std", "Portfolio Beta", "Annualized Sharpe Ratio", "Portfolio CVaR (5%)", "Sortino Ratio"],
@@ -93,22 +92,30 @@ def plot_portfolio_metrics(*portfolios, initial_investment=10000):
         print(f"Portfolio {i+1} Volatility Metrics:")
         print(metrics_table.to_string(index=False))
 
-# Initialize two portfolios
-assets_1 = [TickerWeight('SPY', 0.6), TickerWeight('AGG', 0.4)]
-assets_2 = [TickerWeight('SPY', 0.6), TickerWeight('AGG', 0.3), TickerWeight('TIP', 0.1)]
-start_date = date(2021, 1, 1)
-end_date = date(2023, 12, 31)
-
-portfolio_1 = Portfolio(
-    assets=assets_1,
-    start_date=start_date,
-    end_date=end_date
-)
-
-portfolio_2 = Portfolio(
-    assets=assets_2,
-    start_date=start_date,
-    end_date=end_date
-)
-
-plot_portfolio_metrics(portfolio_1, portfolio_2)
+# Guard so worker processes spawned by the executor can import this module safely
+if __name__ == '__main__':
+    # Initialize two portfolios
+    assets_1 = [TickerWeight('SPY', 0.6), TickerWeight('AGG', 0.4)]
+    assets_2 = [TickerWeight('SPY', 0.6), TickerWeight('AGG', 0.3), TickerWeight('TIP', 0.1)]
+    start_date = date(2021, 1, 1)
+    end_date = date(2023, 12, 31)
+
+    # The two portfolios overlap in tickers, so fetch the union once and share it
+    all_tickers = list(dict.fromkeys(tw.ticker for tw in assets_1 + assets_2))
+    market_returns = fetch_market_returns(all_tickers, start_date, end_date)
+
+    portfolio_1 = Portfolio.from_ticker_weights(
+        assets_1,
+        start_date=start_date,
+        end_date=end_date,
+        market_returns=market_returns
+    )
+
+    portfolio_2 = Portfolio.from_ticker_weights(
+        assets_2,
+        start_date=start_date,
+        end_date=end_date,
+        market_returns=market_returns
+    )
+
+    plot_portfolio_metrics(portfolio_1, portfolio_2)
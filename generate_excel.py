@@ -1,4 +1,5 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from portfolio import Portfolio, TickerWeight
 from datetime import date
 
@@ -26,21 +27,34 @@ def generate_portfolio_excel(portfolio_1: Portfolio, portfolio_2: Portfolio):
 
     metrics_df = pd.DataFrame(metrics_data)
 
-    # Get return metrics data for both portfolios
+    # Get return metrics data for both portfolios; one frame per portfolio,
+    # aligned on the shared DatetimeIndex, avoids duplicated Date columns
     return_data = []
     for i, portfolio in enumerate([portfolio_1, portfolio_2], start=1):
         returns, _, cumulative_pnl, pnl = portfolio.portfolio_return_metrics()
-        returns_df = pd.DataFrame({'Date': returns.index.strftime('%Y-%m-%d'), f'Portfolio {i} Returns': returns.values})
-        pnl_df = pd.DataFrame({'Date': pnl.index.strftime('%Y-%m-%d'), f'Portfolio {i} P&L': pnl.values})
-        cumulative_pnl_df = pd.DataFrame({'Date': cumulative_pnl.index.strftime('%Y-%m-%d'), f'Portfolio {i} Cumulative P&L': cumulative_pnl.values})
-        return_data.extend([returns_df, pnl_df, cumulative_pnl_df])
+        return_data.append(pd.DataFrame({
+            f'Portfolio {i} Returns': returns,
+            f'Portfolio {i} P&L': pnl,
+            f'Portfolio {i} Cumulative P&L': cumulative_pnl
+        }))
 
     return_df = pd.concat(return_data, axis=1)
+    # Keep the dates as datetimes: Excel renders them via a format code, so no
+    # per-date strftime call is needed
+    return_df.insert(0, 'Date', return_df.index)
+    return_df = return_df.reset_index(drop=True)
 
-    # Write to Excel
-    with pd.ExcelWriter("portfolio_metrics.xlsx") as writer:
+    # Write to Excel with xlsxwriter. constant_memory mode cannot be used
+    # here: to_excel writes the body column by column, and constant_memory
+    # silently drops writes above the last-flushed row, corrupting the sheets
+    # datetime_format makes pandas stamp the date cells themselves with
+    # yyyy-mm-dd; a column format would be overridden by pandas' per-cell
+    # default, which carries a spurious 00:00:00 time component
+    with pd.ExcelWriter("portfolio_metrics.xlsx", engine="xlsxwriter",
+                        datetime_format='yyyy-mm-dd') as writer:
         metrics_df.to_excel(writer, sheet_name='Volatility Metrics', index=False)
         return_df.to_excel(writer, sheet_name='Return Metrics', index=False)
+        writer.sheets['Return Metrics'].set_column(0, 0, 12)
 
     print('Produced XSLX file portfolio_metrics.xslx in current directory.')
 
@@ -50,17 +64,11 @@ assets_2 = [TickerWeight('SPY', 0.6), TickerWeight('AGG', 0.3), TickerWeight('TI
 start_date = date(2021, 1, 1)
 end_date = date(2023, 12, 31)
 
-portfolio_1 = Portfolio(
-    assets=assets_1,
-    start_date=start_date,
-    end_date=end_date
-)
-
-portfolio_2 = Portfolio(
-    assets=assets_2,
-    start_date=start_date,
-    end_date=end_date
-)
+# Construct the portfolios concurrently: yf.download is network-bound and
+# releases the GIL, so the two fetches overlap instead of running back to back
+with ThreadPoolExecutor(max_workers=4) as executor:
+    portfolio_1, portfolio_2 = executor.map(
+        lambda assets: Portfolio.from_ticker_weights(assets, start_date, end_date), [assets_1, assets_2])
 
 # Generate Excel sheet
 generate_portfolio_excel(portfolio_1, portfolio_2)
@@ -1,73 +1,229 @@
+import hashlib
+import pickle
+import time
+from pathlib import Path
+
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import namedtuple
 from datetime import date
 
+from portfolio_kernels import compute_all
+
 # Define a namedtuple for holding ticker and weight together
 TickerWeight = namedtuple('TickerWeight', ['ticker', 'weight'])
 
-@dataclass
+# Define a namedtuple for the memoized return metrics
+ReturnMetrics = namedtuple('ReturnMetrics', ['returns', 'value', 'cumulative_pnl', 'pnl'])
+
+class FileCache:
+    """Simple on-disk cache for per-ticker price series.
+
+    Entries live under `.cache/{ticker}/{hash}.pkl`, where the hash encodes
+    ticker, date range, and rebalancing frequency. Each entry stores a write
+    timestamp so stale data expires after `ttl` seconds (90 days by default).
+    """
+
+    def __init__(self, cache_dir: str = '.cache', ttl: float = 90 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    def _entry_path(self, ticker: str, start: date, end: date, freq: str) -> Path:
+        key = hashlib.md5(f"{ticker}|{start}|{end}|{freq}".encode()).hexdigest()
+        return self.cache_dir / ticker / f"{key}.pkl"
+
+    def get(self, ticker: str, start: date, end: date, freq: str) -> pd.Series | None:
+        """Return the cached series for a ticker, or None on a miss/expiry."""
+        path = self._entry_path(ticker, start, end, freq)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            if time.time() - entry['ts'] > self.ttl:
+                return None
+            return entry['data']
+        except (OSError, pickle.UnpicklingError, KeyError, EOFError):
+            # Missing or corrupt entries fall through to a fresh fetch
+            return None
+
+    def put(self, ticker: str, start: date, end: date, freq: str, series: pd.Series):
+        """Store a ticker's price series alongside a write timestamp."""
+        path = self._entry_path(ticker, start, end, freq)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({'ts': time.time(), 'data': series}, f)
+
+def fetch_market_data(tickers: list[str], start_date: date, end_date: date,
+                      rebalancing_frequency: str = '1mo') -> pd.DataFrame:
+    """Fetch adjusted closing prices for the given tickers and date range.
+
+    Prices are cached on disk per ticker, so only tickers missing from the
+    cache (or with expired entries) are downloaded from Yahoo Finance.
+    """
+    cache = FileCache()
+    series = {}
+    misses = []
+    for ticker in tickers:
+        cached = cache.get(ticker, start_date, end_date, rebalancing_frequency)
+        if cached is not None:
+            series[ticker] = cached
+        else:
+            misses.append(ticker)
+
+    if misses:
+        # threads=True lets yfinance fetch the missing tickers concurrently
+        data = yf.download(' '.join(misses), start=start_date, end=end_date,
+                           interval=rebalancing_frequency, progress=False, threads=True)['Adj Close']
+        if isinstance(data, pd.Series):  # single-ticker download returns a Series
+            data = data.to_frame(misses[0])
+        for ticker in misses:
+            series[ticker] = data[ticker]
+            cache.put(ticker, start_date, end_date, rebalancing_frequency, data[ticker])
+
+    return pd.concat([series[ticker] for ticker in tickers], axis=1, keys=tickers)
+
+def fetch_market_returns(tickers: list[str], start_date: date, end_date: date,
+                         rebalancing_frequency: str = '1mo') -> pd.DataFrame:
+    """Fetch market data once and return percent-change returns for the tickers.
+
+    Useful for sharing a single download across several portfolios that differ
+    only in weights: pass the result as `market_returns` when constructing them.
+    """
+    data = fetch_market_data(tickers, start_date, end_date, rebalancing_frequency)
+    return data.pct_change().dropna().astype(np.float32)
+
+@dataclass(slots=True)
 class Portfolio:
     """Class for representing a financial portfolio.
 
+    Holdings are stored structure-of-arrays style — a tuple of tickers and a
+    weight vector — rather than as a list of per-asset tuples. Use
+    `from_ticker_weights` to construct from `TickerWeight` pairs.
+
     Attributes:
-        assets (list[TickerWeight]): List of (ticker: str, weight: float) tuples representing assets and their weights.
+        tickers (tuple[str, ...]): Ticker symbols of the assets in the portfolio.
+        weights (np.ndarray): Asset weights; normalized to sum to 1 on construction.
         start_date (date): Start date of the portfolio.
         end_date (date): End date of the portfolio.
         rebalancing_frequency (str, optional): Frequency of portfolio rebalancing (default: '1mo', monthly).
+        market_returns (pd.DataFrame, optional): Precomputed market returns for the tickers.
+            When provided, the market-data fetch is skipped entirely, allowing several
+            portfolios with the same tickers to share a single download.
     """
-    assets: list[TickerWeight]
+    tickers: tuple[str, ...]
+    weights: np.ndarray
     start_date: date
     end_date: date
     rebalancing_frequency: str = '1mo'
+    market_returns: pd.DataFrame = None
+    market_data: pd.DataFrame = field(init=False, default=None, repr=False)
+    _return_metrics_cache: ReturnMetrics = field(init=False, default=None, repr=False)
+    _kernel_cache: tuple = field(init=False, default=None, repr=False)
+    _market_avg_cache: np.ndarray = field(init=False, default=None, repr=False)
+    _volatility_decomp_cache: np.ndarray = field(init=False, default=None, repr=False)
 
     def __post_init__(self):
         """Post-initialization to set up additional attributes."""
-        self.tickers = [asset.ticker for asset in self.assets]
-        self.weights = np.array([asset.weight for asset in self.assets])
+        self.tickers = tuple(self.tickers)
+        self.weights = np.asarray(self.weights, dtype=np.float64)
         self.weights = self.weights / np.sum(self.weights)  # Normalize weights
-        self.market_data = self.get_market_data()
-        self.market_returns = self.calculate_market_returns()
+        if self.market_returns is None:
+            self.market_data = self.get_market_data()
+            self.market_returns = self.calculate_market_returns()
+        else:
+            self.market_returns = self.market_returns[list(self.tickers)]
+
+    @classmethod
+    def from_ticker_weights(cls, assets: list[TickerWeight], start_date: date, end_date: date,
+                            rebalancing_frequency: str = '1mo', market_returns: pd.DataFrame = None) -> 'Portfolio':
+        """Build a Portfolio from a list of (ticker, weight) TickerWeight pairs."""
+        tickers = tuple(asset.ticker for asset in assets)
+        weights = np.array([asset.weight for asset in assets])
+        return cls(tickers, weights, start_date, end_date, rebalancing_frequency, market_returns)
 
     def get_market_data(self) -> pd.DataFrame:
         """Fetch adjusted closing prices for the given tickers and date range."""
-        data = yf.download(self.tickers, start=self.start_date, end=self.end_date, 
-                           interval=self.rebalancing_frequency, progress=False)['Adj Close']
-        return data
+        return fetch_market_data(self.tickers, self.start_date, self.end_date, self.rebalancing_frequency)
 
     def calculate_market_returns(self) -> pd.DataFrame:
-        """Calculate market returns with specified frequency, process data."""
-        returns = self.market_data.pct_change().dropna()
+        """Calculate market returns with specified frequency, process data.
+
+        Returns are kept in float32: well within precision for return data,
+        and half the memory traffic once daily data with many tickers shows up.
+        """
+        returns = self.market_data.pct_change().dropna().astype(np.float32)
         return returns
 
     def asset_volatility_decomposition(self) -> np.ndarray:
         """Calculate the contribution of each asset to portfolio volatility.
 
+        The result is memoized, so consumers that share a portfolio instance
+        (plotting, Excel export) reuse one array.
+
         Returns:
             np.ndarray: Array of asset volatility contributions.
         """
-        asset_volatilities = self.market_returns.std(axis=0)
-        asset_volatility_decomposition = asset_volatilities * self.weights
-        return asset_volatility_decomposition
+        if self._volatility_decomp_cache is None:
+            asset_volatilities = np.std(self.market_returns.to_numpy(), axis=0, ddof=1)
+            self._volatility_decomp_cache = asset_volatilities * self.weights
+        return self._volatility_decomp_cache
 
-    def portfolio_return_metrics(self) -> tuple[np.ndarray, pd.Series, pd.Series, pd.Series]:
+    @property
+    def _market_avg_returns(self) -> np.ndarray:
+        """Memoized equal-weighted market benchmark used for the beta calculation."""
+        if self._market_avg_cache is None:
+            self._market_avg_cache = self.market_returns.mean(axis=1).to_numpy()
+        return self._market_avg_cache
+
+    def _run_kernel(self, risk_free_rate: float = 0.0, alpha: float = 0.05) -> tuple:
+        """Run the fused numeric kernel on the returns matrix.
+
+        The default-argument result is memoized, so calling both metric
+        methods on the same portfolio runs the kernel once; non-default
+        `risk_free_rate`/`alpha` recompute. The kernel follows the returns
+        dtype, so float32 market returns run through the whole metric
+        pipeline at fp32 vector throughput.
+        """
+        default_args = risk_free_rate == 0.0 and alpha == 0.05
+        if default_args and self._kernel_cache is not None:
+            return self._kernel_cache
+        R = np.ascontiguousarray(self.market_returns.to_numpy())
+        w = np.ascontiguousarray(self.weights, dtype=R.dtype)
+        result = compute_all(R, w, self._market_avg_returns, risk_free_rate, alpha)
+        if default_args:
+            self._kernel_cache = result
+        return result
+
+    @property
+    def _return_metrics(self) -> ReturnMetrics:
+        """Memoized return metrics, computed once per portfolio."""
+        if self._return_metrics_cache is None:
+            returns, value, cumulative_pnl, pnl, *_ = self._run_kernel()
+            index = self.market_returns.index
+            self._return_metrics_cache = ReturnMetrics(
+                pd.Series(returns, index=index), pd.Series(value, index=index),
+                pd.Series(cumulative_pnl, index=index), pd.Series(pnl, index=index))
+        return self._return_metrics_cache
+
+    def portfolio_return_metrics(self) -> ReturnMetrics:
         """Calculate portfolio return metrics.
 
+        The result is memoized, and the underlying kernel run is shared with
+        `portfolio_volatility_metrics`, so repeated calls do no extra work.
+
         Returns:
-            tuple[np.ndarray, pd.Series, pd.Series, pd.Series]: Tuple containing portfolio returns,
-            cumulative portfolio value, cumulative profit and loss, and monthly profit and loss.
+            ReturnMetrics: Named tuple containing portfolio returns, cumulative
+            portfolio value, cumulative profit and loss, and monthly profit and loss.
         """
-        portfolio_returns = self.market_returns @ self.weights
-        portfolio_value = (1 + portfolio_returns).cumprod()
-        cumulative_pnl = portfolio_value - 1
-        pnl = portfolio_value.diff().fillna(0)
-        return portfolio_returns, portfolio_value, cumulative_pnl, pnl
+        return self._return_metrics
 
     def portfolio_volatility_metrics(self, risk_free_rate: float = 0.0, alpha: float = 0.05) -> tuple[float, float, float, float, float]:
         """Calculate portfolio volatility metrics.
 
+        The statistics come from the fused JIT-compiled kernel, which computes
+        them in a single pass over the returns matrix.
+
         Args:
             risk_free_rate (float, optional): Risk-free rate (default: 0.0).
             alpha (float, optional): Significance level for Value at Risk (default: 0.05).
@@ -76,14 +232,5 @@ class Portfolio:
             tuple[float, float, float, float, float]: Tuple containing annualized standard deviation,
             portfolio beta, annualized Sharpe ratio, Conditional Value at Risk (CVaR), and Sortino ratio.
         """
-        portfolio_returns, _, _, _ = self.portfolio_return_metrics()
-        market_returns = self.market_returns.mean(axis=1)
-        portfolio_beta = portfolio_returns.cov(market_returns) / market_returns.var()
-        portfolio_var = portfolio_returns.quantile(alpha)
-        portfolio_cvar = portfolio_returns[portfolio_returns <= portfolio_var].mean()
-        portfolio_annualized_std = portfolio_returns.std() * np.sqrt(12) * 100
-        annualized_sharpe_ratio = (portfolio_returns.mean() - risk_free_rate) / portfolio_annualized_std * np.sqrt(12)
-        downside_returns = portfolio_returns[portfolio_returns < risk_free_rate]
-        downside_std = downside_returns.std() if not downside_returns.empty else np.nan
-        sortino_ratio = (portfolio_returns.mean() - risk_free_rate) / downside_std if not np.isnan(downside_std) else np.nan
-        return portfolio_annualized_std, portfolio_beta, annualized_sharpe_ratio, portfolio_cvar, sortino_ratio
+        *_, annualized_std, beta, sharpe, cvar, sortino = self._run_kernel(risk_free_rate, alpha)
+        return float(annualized_std), float(beta), float(sharpe), float(cvar), float(sortino)
@@ -0,0 +1,62 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python/NumPy
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def decorator(func):
+            return func
+        return decorator
+
+@njit(cache=True, fastmath=True)
+def compute_all(R, w, m, risk_free_rate, alpha):
+    """Compute all portfolio return and volatility metrics in one fused pass.
+
+    Args:
+        R (float[:, :]): Per-asset return matrix, one row per period. Both
+            float32 and float64 matrices are supported; the kernel specializes
+            per dtype.
+        w (float[:]): Normalized portfolio weight vector, same dtype as R.
+        m (float[:]): Market benchmark returns (average of the asset returns
+            per period), precomputed and cached by the caller.
+        risk_free_rate (float): Risk-free rate for Sharpe/Sortino ratios.
+        alpha (float): Significance level for Value at Risk.
+
+    Returns:
+        tuple: (returns, value, cumulative_pnl, pnl, annualized_std, beta,
+        sharpe, cvar, sortino) — the first four as float64 arrays, the rest
+        as scalars.
+    """
+    T = R.shape[0]
+    r = R @ w
+    # Accumulate in log space: expm1(cumsum(log1p(r))) matches cumprod(1 + r) - 1
+    # but is an add-reduce, numerically stabler over long horizons
+    cumulative_pnl = np.expm1(np.cumsum(np.log1p(r)))
+    value = cumulative_pnl + 1.0
+    # pnl[t] = value[t] - value[t-1] = value[t-1] * r[t], reusing values
+    # already on hand instead of re-differencing the cumulative product
+    pnl = np.empty(T)
+    pnl[0] = 0.0
+    for t in range(1, T):
+        pnl[t] = value[t - 1] * r[t]
+
+    r_mean = r.mean()
+    m_mean = m.mean()
+    beta = ((r - r_mean) * (m - m_mean)).sum() / ((m - m_mean) ** 2).sum()
+    var = np.quantile(r, alpha)
+    cvar = r[r <= var].mean()
+    r_std = np.sqrt(((r - r_mean) ** 2).sum() / (T - 1))
+    annualized_std = r_std * np.sqrt(12.0) * 100.0
+    sharpe = (r_mean - risk_free_rate) / annualized_std * np.sqrt(12.0)
+
+    downside = r[r < risk_free_rate]
+    if downside.size > 1:
+        d_mean = downside.mean()
+        downside_std = np.sqrt(((downside - d_mean) ** 2).sum() / (downside.size - 1))
+        sortino = (r_mean - risk_free_rate) / downside_std
+    else:
+        sortino = np.nan
+
+    return r, value, cumulative_pnl, pnl, annualized_std, beta, sharpe, cvar, sortino